@@ -1,16 +1,24 @@
 import asyncio
+import functools
 import json
 import logging
 import os
+import re
+import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
-from datetime import datetime
 
 from aiogram import Bot, Dispatcher, F, Router
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import CommandStart
 from aiogram.types import (
+    BufferedInputFile,
     FSInputFile,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
+    InputFile,
+    InputMediaPhoto,
     KeyboardButton,
     Message,
     ReplyKeyboardMarkup,
@@ -18,6 +26,7 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 from dotenv import load_dotenv
+import orjson
 
 # Load environment variables
 load_dotenv()
@@ -31,27 +40,160 @@ BOT_TOKEN = os.getenv("BOT_TOKEN")
 if not BOT_TOKEN:
     raise ValueError("BOT_TOKEN not found in .env file")
 
-bot = Bot(token=BOT_TOKEN)
+# Connection pool settings so concurrent sends reuse keep-alive connections
+SESSION_CONNECTOR_KWARGS = {
+    "limit_per_host": 50,
+    "keepalive_timeout": 75,
+    "enable_cleanup_closed": True
+}
+
+class KeepAliveAiohttpSession(AiohttpSession):
+    """HTTP session with a larger keep-alive connection pool."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._connector_init.update(SESSION_CONNECTOR_KWARGS)
+    
+    def _setup_proxy_connector(self, proxy) -> None:
+        # Proxy setup replaces the connector config, so re-apply the pool settings
+        super()._setup_proxy_connector(proxy)
+        self._connector_init.update(SESSION_CONNECTOR_KWARGS)
+
+bot = Bot(token=BOT_TOKEN, session=KeepAliveAiohttpSession())
 dp = Dispatcher()
 router = Router()
 dp.include_router(router)
 
 # Data loading module
-def load_products() -> list[dict]:
-    """Load products from data/products.json."""
-    products_path = Path("data/products.json")
-    if not products_path.exists():
+PRODUCTS_PATH = Path("data/products.json")
+
+# Images up to this size are kept in memory instead of re-read from disk per send
+MAX_BUFFERED_IMAGE_BYTES = 512 * 1024
+
+# Telegram file_ids of already uploaded images, persisted across restarts
+FILE_IDS_PATH = Path("data/file_ids.json")
+_FILE_IDS: dict[str, dict] | None = None
+_FILE_IDS_LOCK = asyncio.Lock()
+
+# Cached (mtime, products) pair; refreshed only when the file changes on disk
+_PRODUCTS_CACHE: tuple[float, list[dict]] | None = None
+
+# Products bucketed by category, rebuilt together with the cache
+_BY_CATEGORY: dict[str, list[dict]] = {}
+
+# In-flight reload shared by handlers that hit a stale cache at the same time
+_RELOAD_TASK: asyncio.Future | None = None
+
+def _products_mtime() -> float:
+    """Get the mtime of data/products.json."""
+    try:
+        return PRODUCTS_PATH.stat().st_mtime
+    except FileNotFoundError:
         logger.error("products.json not found in data/ folder")
         raise FileNotFoundError("data/products.json missing")
+
+def load_products() -> list[dict]:
+    """Load products from data/products.json, reusing the cached copy while the file is unchanged."""
+    global _PRODUCTS_CACHE, _BY_CATEGORY
+    mtime = _products_mtime()
+    if _PRODUCTS_CACHE is not None and _PRODUCTS_CACHE[0] == mtime:
+        return _PRODUCTS_CACHE[1]
     
     try:
-        with open(products_path, "r", encoding="utf-8") as f:
-            products = json.load(f)
-        logger.info(f"Loaded {len(products)} products from JSON")
-        return products
-    except json.JSONDecodeError as e:
+        products = orjson.loads(PRODUCTS_PATH.read_bytes())
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in products.json: {e}")
         raise ValueError("Invalid JSON format in products.json")
+    
+    valid: list[dict] = []
+    by_category: dict[str, list[dict]] = {}
+    for p in products:
+        try:
+            _prepare_product(p)
+        except (KeyError, TypeError) as e:
+            logger.error(f"Skipping invalid product {p.get('id')}: missing or bad field {e}")
+            continue
+        valid.append(p)
+        by_category.setdefault(p.get("category"), []).append(p)
+    logger.info(f"Loaded {len(valid)} products from JSON")
+    
+    _PRODUCTS_CACHE = (mtime, valid)
+    _BY_CATEGORY = by_category
+    return valid
+
+async def load_products_async() -> list[dict]:
+    """Load products, reloading off the event loop and only once per file change."""
+    global _RELOAD_TASK
+    if _PRODUCTS_CACHE is not None and _PRODUCTS_CACHE[0] == _products_mtime():
+        return _PRODUCTS_CACHE[1]
+    
+    if _RELOAD_TASK is None or _RELOAD_TASK.done():
+        _RELOAD_TASK = asyncio.ensure_future(asyncio.to_thread(load_products))
+    # Shielded so one cancelled handler doesn't cancel the reload for the others
+    return await asyncio.shield(_RELOAD_TASK)
+
+def _prepare_product(product: dict) -> None:
+    """Precompute the caption template, keyboard and photo sent for a product."""
+    image_path = Path(product.get("image", ""))
+    product["_photo"] = load_photo(image_path)
+    product["_file_id"] = None
+    if product["_photo"] is not None:
+        # Reuse a previous upload only if the image is unchanged since then; checked
+        # here at reload, off the event loop, so sends never touch the disk
+        product["_image_mtime"] = _image_mtime(image_path)
+        cached = _load_file_ids().get(product["image"])
+        if cached and cached.get("mtime") == product["_image_mtime"]:
+            product["_file_id"] = cached["file_id"]
+    product["_caption_tpl"] = _build_caption(product)
+    product["_keyboard"] = _build_product_keyboard(product["detail_url"])
+
+def load_photo(image_path: Path) -> InputFile | None:
+    """Load an image as an in-memory upload, or stream large files from disk."""
+    try:
+        if not image_path.is_file():
+            return None
+        if image_path.stat().st_size > MAX_BUFFERED_IMAGE_BYTES:
+            return FSInputFile(image_path)
+        return BufferedInputFile(image_path.read_bytes(), filename=image_path.name)
+    except OSError as e:
+        logger.warning(f"Could not read image {image_path}: {e}")
+        return None
+
+def _load_file_ids() -> dict[str, dict]:
+    """Load uploaded image file_ids from data/file_ids.json."""
+    global _FILE_IDS
+    if _FILE_IDS is None:
+        try:
+            with open(FILE_IDS_PATH, "r", encoding="utf-8") as f:
+                _FILE_IDS = json.load(f)
+        except FileNotFoundError:
+            _FILE_IDS = {}
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON in file_ids.json, ignoring it: {e}")
+            _FILE_IDS = {}
+    return _FILE_IDS
+
+def _write_file_ids(file_ids: dict[str, dict]) -> None:
+    """Atomically write uploaded image file_ids to data/file_ids.json."""
+    tmp_path = FILE_IDS_PATH.with_name(FILE_IDS_PATH.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(file_ids, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, FILE_IDS_PATH)
+    except OSError as e:
+        logger.warning(f"Could not save file_ids.json: {e}")
+
+async def _persist_file_ids() -> None:
+    """Save the file_id cache without blocking the event loop."""
+    async with _FILE_IDS_LOCK:
+        await asyncio.to_thread(_write_file_ids, dict(_load_file_ids()))
+
+def _image_mtime(image_path: Path) -> float | None:
+    """Get an image's mtime, or None if it can't be read."""
+    try:
+        return image_path.stat().st_mtime
+    except OSError:
+        return None
 
 # Platform selection
 PLATFORM_MAP = {
@@ -68,47 +210,17 @@ CATEGORY_MAP = {
     "home_appliances": "🏠 الأجهزة المنزلية"
 }
 
-def get_greeting() -> str:
-    """Get dynamic greeting based on time of day."""
-    hour = datetime.now().hour
-    if 5 <= hour < 12:
-        return "صباح الخير! 🌅"
-    elif 12 <= hour < 18:
-        return "مساء الخير! ☀️"
-    else:
-        return "مساء الخير! 🌙"
-
-def get_products_by_category(products: list[dict], category: str) -> list[dict]:
-    """Filter products by category."""
-    return [p for p in products if p.get("category") == category][:3]  # Limit to 3
+# Reverse mapping (Arabic button labels back to English JSON keys)
+CATEGORY_LABEL_TO_KEY = {v: k for k, v in CATEGORY_MAP.items()}
 
-def get_placeholder_image() -> FSInputFile:
-    """Get fallback placeholder image."""
-    placeholder_path = Path("assets/placeholder.jpg")
-    if not placeholder_path.exists():
-        logger.warning("Placeholder image not found; using text fallback")
-        return None
-    return FSInputFile(placeholder_path)
+# Button label sets used to build the text dispatch table
+_CATEGORY_VALUES: frozenset[str] = frozenset(CATEGORY_MAP.values())
+_PLATFORM_VALUES: frozenset[str] = frozenset(PLATFORM_MAP.values())
+_COMING_SOON_TEXTS: frozenset[str] = _PLATFORM_VALUES - {PLATFORM_MAP["amazon"]}
 
-def escape_markdown_v2(text: str) -> str:
-    """Escape special characters for MarkdownV2."""
-    reserved_chars = r'_*[]()~`>#+-=|{}.!/'
-    for char in reserved_chars:
-        text = text.replace(char, f'\\{char}')
-    return text
-
-# Handlers
-@router.message(CommandStart())
-async def start_handler(message: Message):
-    """Handle /start command with beautiful design."""
-    greeting = get_greeting()
-    welcome_text = (
-        f"{greeting}\n\n"
-        "🎉 **مرحباً بك في متجرنا الإلكتروني!** 🌟\n\n"
-        "✨ *اختر المنصة التي تريد استعراض عروضها:*"
-    )
-    
-    # Beautiful platform selection keyboard
+# Static keyboards, built once at import and reused by every handler
+def _build_platform_keyboard() -> ReplyKeyboardMarkup:
+    """Build beautiful platform selection keyboard."""
     builder = ReplyKeyboardBuilder()
     
     # Add platform buttons with beautiful spacing
@@ -117,23 +229,14 @@ async def start_handler(message: Message):
     
     builder.adjust(1)  # One button per row for better UX
     
-    keyboard = builder.as_markup(
+    return builder.as_markup(
         resize_keyboard=True, 
         one_time_keyboard=False,
         input_field_placeholder="👉 اختر منصة..."
     )
-    
-    await message.answer(welcome_text, reply_markup=keyboard, parse_mode="Markdown")
 
-@router.message(F.text == "🚀 أمازون")
-async def amazon_handler(message: Message):
-    """Handle Amazon platform selection with beautiful design."""
-    welcome_text = (
-        "🚀 **مرحباً بك في أمازون!**\n\n"
-        "🛍️ *اختر القسم الذي يهمك لعرض العروض الحصرية:*"
-    )
-    
-    # Beautiful category keyboard for Amazon
+def _build_amazon_category_keyboard() -> ReplyKeyboardMarkup:
+    """Build beautiful category keyboard for Amazon."""
     builder = ReplyKeyboardBuilder()
     
     # Add category buttons with emojis
@@ -145,24 +248,125 @@ async def amazon_handler(message: Message):
     
     builder.adjust(2)  # Two buttons per row
     
-    keyboard = builder.as_markup(
+    return builder.as_markup(
         resize_keyboard=True, 
         one_time_keyboard=False,
         input_field_placeholder="🎯 اختر القسم..."
     )
+
+PLATFORM_KB = _build_platform_keyboard()
+AMAZON_CATEGORY_KB = _build_amazon_category_keyboard()
+
+EMPTY_CATEGORY_KB = ReplyKeyboardMarkup(
+    keyboard=[[KeyboardButton(text="↩️ رجوع إلى المنصات")]],
+    resize_keyboard=True
+)
+
+END_OF_LIST_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text="🛒 عرض المزيد"), KeyboardButton(text="↩️ رجوع إلى المنصات")]
+    ],
+    resize_keyboard=True
+)
+
+COMING_SOON_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text="🚀 أمازون")],
+        [KeyboardButton(text="↩️ رجوع إلى المنصات")]
+    ],
+    resize_keyboard=True
+)
+
+REMOVE_KB = ReplyKeyboardRemove()
+
+# Cached (minute, greeting) pair; the greeting only changes at hour boundaries
+_GREETING_CACHE: tuple[int, str] | None = None
+
+def get_greeting() -> str:
+    """Get dynamic greeting based on time of day, recomputed at most once a minute."""
+    global _GREETING_CACHE
+    now_min = int(time.monotonic() // 60)
+    if _GREETING_CACHE is not None and _GREETING_CACHE[0] == now_min:
+        return _GREETING_CACHE[1]
+    
+    hour = time.localtime().tm_hour
+    if 5 <= hour < 12:
+        greeting = "صباح الخير! 🌅"
+    elif 12 <= hour < 18:
+        greeting = "مساء الخير! ☀️"
+    else:
+        greeting = "مساء الخير! 🌙"
+    
+    _GREETING_CACHE = (now_min, greeting)
+    return greeting
+
+def get_products_by_category(category: str) -> list[dict]:
+    """Get products of a category from the index built by load_products()."""
+    return _BY_CATEGORY.get(category, [])[:3]  # Limit to 3
+
+def get_placeholder_image() -> InputFile | None:
+    """Get fallback placeholder image."""
+    placeholder = load_photo(Path("assets/placeholder.jpg"))
+    if placeholder is None:
+        logger.warning("Placeholder image not found; using text fallback")
+    return placeholder
+
+# Resolved once at import so sends never stat the placeholder
+PLACEHOLDER_PHOTO = get_placeholder_image()
+
+# Translation table mapping each MarkdownV2 reserved char to its escaped form
+_MDV2_TABLE = str.maketrans({c: f'\\{c}' for c in r'_*[]()~`>#+-=|{}.!/'})
+
+def escape_markdown_v2(text: str) -> str:
+    """Escape special characters for MarkdownV2."""
+    return text.translate(_MDV2_TABLE)
+
+# Memoized escaping for text that repeats across products, such as prices
+_escape_cached = functools.lru_cache(maxsize=1024)(escape_markdown_v2)
+
+# Single-pass rewrite of MarkdownV2 captions into plain text for the send fallback
+_MD_FALLBACK_MAP = {'\\*': '*', '~~': '', '➡️': '->'}
+_MD_FALLBACK_RE = re.compile('|'.join(map(re.escape, _MD_FALLBACK_MAP)))
+
+# Menus shared by several handlers
+async def _send_platform_menu(message: Message):
+    """Send the greeting with the platform selection keyboard."""
+    greeting = get_greeting()
+    welcome_text = (
+        f"{greeting}\n\n"
+        "🎉 **مرحباً بك في متجرنا الإلكتروني!** 🌟\n\n"
+        "✨ *اختر المنصة التي تريد استعراض عروضها:*"
+    )
+    
+    await message.answer(welcome_text, reply_markup=PLATFORM_KB, parse_mode="Markdown")
+
+async def _send_amazon_menu(message: Message):
+    """Send the Amazon welcome with the category keyboard."""
+    welcome_text = (
+        "🚀 **مرحباً بك في أمازون!**\n\n"
+        "🛍️ *اختر القسم الذي يهمك لعرض العروض الحصرية:*"
+    )
     
-    await message.answer(welcome_text, reply_markup=keyboard, parse_mode="Markdown")
+    await message.answer(welcome_text, reply_markup=AMAZON_CATEGORY_KB, parse_mode="Markdown")
+
+# Handlers
+@router.message(CommandStart())
+async def start_handler(message: Message):
+    """Handle /start command with beautiful design."""
+    await _send_platform_menu(message)
+
+async def amazon_handler(message: Message):
+    """Handle Amazon platform selection with beautiful design."""
+    await _send_amazon_menu(message)
 
-@router.message(F.text == "↩️ رجوع إلى المنصات")
 async def back_to_platforms_handler(message: Message):
     """Handle back to platforms."""
-    await start_handler(message)
+    await _send_platform_menu(message)
 
-@router.message(F.text.in_(list(CATEGORY_MAP.values())))
 async def category_handler(message: Message):
     """Handle category selection with beautiful product display."""
     try:
-        products = load_products()
+        await load_products_async()  # Refreshes the category index if the file changed
     except (FileNotFoundError, ValueError) as e:
         logger.error(f"Data load error: {e}")
         await message.answer(
@@ -172,20 +376,17 @@ async def category_handler(message: Message):
         return
     
     # Map Arabic text back to English category
-    selected_category = next((k for k, v in CATEGORY_MAP.items() if v == message.text), None)
+    selected_category = CATEGORY_LABEL_TO_KEY.get(message.text)
     if not selected_category:
         await message.answer("❌ قسم غير معروف. استخدم /start للبدء.")
         return
     
-    cat_products = get_products_by_category(products, selected_category)
+    cat_products = get_products_by_category(selected_category)
     if not cat_products:
         await message.answer(
             "📦 **لا توجد منتجات في هذا القسم حالياً**\n\n"
             "✨ جاري تحديث العروض قريباً!",
-            reply_markup=ReplyKeyboardMarkup(
-                keyboard=[[KeyboardButton(text="↩️ رجوع إلى المنصات")]],
-                resize_keyboard=True
-            ),
+            reply_markup=EMPTY_CATEGORY_KB,
             parse_mode="Markdown"
         )
         return
@@ -193,13 +394,13 @@ async def category_handler(message: Message):
     # Remove keyboard and show loading message
     await message.answer(
         f"🔄 **جاري تحميل المنتجات في {message.text}...**", 
-        reply_markup=ReplyKeyboardRemove(),
+        reply_markup=REMOVE_KB,
         parse_mode="Markdown"
     )
     
-    # Send each product with beautiful design
-    for idx, product in enumerate(cat_products, 1):
-        await send_product_message(message, product, idx)
+    # Send products as a single album when possible, otherwise one message each
+    if not await send_products_album(message, cat_products):
+        await send_products_individually(message, cat_products)
     
     # End of list message with beautiful back button
     end_text = (
@@ -207,36 +408,114 @@ async def category_handler(message: Message):
         "💫 *اختر قسم آخر أو عد إلى القائمة الرئيسية*"
     )
     
-    back_keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="🛒 عرض المزيد"), KeyboardButton(text="↩️ رجوع إلى المنصات")]
-        ],
-        resize_keyboard=True
-    )
-    
-    await message.answer(end_text, reply_markup=back_keyboard, parse_mode="Markdown")
+    await message.answer(end_text, reply_markup=END_OF_LIST_KB, parse_mode="Markdown")
 
-@router.message(F.text == "🛒 عرض المزيد")
 async def show_more_handler(message: Message):
     """Handle show more products."""
-    await amazon_handler(message)
+    await _send_amazon_menu(message)
+
+def _photo_ref(product: dict) -> InputFile | str | None:
+    """Get the photo to send for a product: a cached file_id, the image or the placeholder."""
+    return product["_file_id"] or product["_photo"] or PLACEHOLDER_PHOTO
+
+def _remember_upload(product: dict, sent: Message) -> bool:
+    """Upload each product image only once; later sends reuse the file_id."""
+    if product["_file_id"] is None and product["_photo"] is not None:
+        product["_file_id"] = sent.photo[-1].file_id
+        _load_file_ids()[product["image"]] = {
+            "mtime": product["_image_mtime"],
+            "file_id": product["_file_id"]
+        }
+        return True
+    return False
+
+def _is_file_id_error(error: TelegramBadRequest) -> bool:
+    """Check whether Telegram rejected the file_id itself, not e.g. the caption."""
+    text = error.message.lower()
+    return "file identifier" in text or "file_id" in text
+
+def _forget_file_id(product: dict) -> None:
+    """Drop a product's cached file_id, e.g. after Telegram rejected it."""
+    product["_file_id"] = None
+    _load_file_ids().pop(product["image"], None)
+
+async def _answer_product_photo(message: Message, product: dict, **kwargs) -> Message:
+    """Send a product photo, uploading it again if Telegram rejects the cached file_id."""
+    file_id = product["_file_id"]
+    if file_id:
+        try:
+            return await message.answer_photo(photo=file_id, **kwargs)
+        except TelegramBadRequest as e:
+            if not _is_file_id_error(e):
+                raise
+            logger.warning(f"Cached file_id of product {product['id']} rejected, uploading again: {e}")
+            _forget_file_id(product)
+            await _persist_file_ids()
+    
+    sent = await message.answer_photo(photo=product["_photo"] or PLACEHOLDER_PHOTO, **kwargs)
+    if _remember_upload(product, sent):
+        await _persist_file_ids()
+    return sent
+
+async def send_products_album(message: Message, products: list[dict]) -> bool:
+    """Send products as one media group plus a buy-links keyboard; False if not possible."""
+    # Media groups need 2-10 items, all with photos
+    if not 2 <= len(products) <= 10:
+        return False
+    photos = [_photo_ref(p) for p in products]
+    if not all(photos):
+        return False
+    
+    media = [
+        InputMediaPhoto(
+            media=photo,
+            caption=product["_caption_tpl"].format(idx=idx),
+            parse_mode="MarkdownV2"
+        )
+        for idx, (product, photo) in enumerate(zip(products, photos), 1)
+    ]
+    # Only a rejected album falls back; timeouts and flood control propagate, since the
+    # album may already be delivered and resending each product would duplicate it
+    try:
+        sent_messages = await message.answer_media_group(media=media)
+    except TelegramBadRequest as e:
+        # The error doesn't say which item failed; the per-product fallback
+        # drops only file_ids that Telegram rejects there
+        logger.error(f"Failed to send products album: {e}")
+        return False
+    
+    uploaded = [_remember_upload(product, sent) for product, sent in zip(products, sent_messages)]
+    if any(uploaded):
+        await _persist_file_ids()
+    
+    # Media groups can't carry inline keyboards, so list all buy links in one message
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text=f"🛒 اشترِ المنتج {idx}", url=product["detail_url"])]
+        for idx, product in enumerate(products, 1)
+    ])
+    await message.answer("👇 *اختر المنتج للشراء:*", reply_markup=keyboard, parse_mode="Markdown")
+    return True
+
+async def send_products_individually(message: Message, products: list[dict]):
+    """Send each product as its own message, in order."""
+    # Sequential on purpose: captions are numbered, so concurrent sends could arrive out of order
+    for idx, product in enumerate(products, 1):
+        try:
+            await send_product_message(message, product, idx)
+        except Exception as e:
+            logger.error(f"Failed to send fallback for product {product['id']}: {e}")
 
 async def send_product_message(message: Message, product: dict, idx: int):
     """Send a beautiful product message with photo and caption."""
-    image_path = Path(product.get("image", ""))
-    photo = None
-    if image_path.exists():
-        photo = FSInputFile(image_path)
-    else:
-        photo = get_placeholder_image()
-    
-    caption = await _build_caption(product, idx)
-    keyboard = await _build_product_keyboard(product["detail_url"])
+    photo = _photo_ref(product)
+    caption = product["_caption_tpl"].format(idx=idx)
+    keyboard = product["_keyboard"]
     
     try:
         if photo:
-            await message.answer_photo(
-                photo=photo, 
+            await _answer_product_photo(
+                message,
+                product,
                 caption=caption, 
                 reply_markup=keyboard, 
                 parse_mode="MarkdownV2"
@@ -250,24 +529,24 @@ async def send_product_message(message: Message, product: dict, idx: int):
     except Exception as e:
         logger.error(f"Failed to send product {product['id']}: {e}")
         # Fallback to plain text with beautiful design
-        plain_caption = caption.replace('\\*', '*').replace('~~', '').replace('➡️', '->')
+        plain_caption = _MD_FALLBACK_RE.sub(lambda m: _MD_FALLBACK_MAP[m.group(0)], caption)
         await message.answer(plain_caption, reply_markup=keyboard)
 
-async def _build_caption(product: dict, idx: int) -> str:
-    """Build beautiful formatted Arabic caption for a product."""
+def _build_caption(product: dict) -> str:
+    """Build beautiful formatted Arabic caption for a product, with an {idx} placeholder."""
     title = product["title"]
     old_price = product.get("old_price", 0)
     new_price = product["new_price"]
     savings = old_price - new_price if old_price > 0 else 0
     
-    # Escape text for MarkdownV2
-    escaped_title = escape_markdown_v2(title)
-    escaped_old_price = escape_markdown_v2(f"{old_price} ريال")
-    escaped_new_price = escape_markdown_v2(f"{new_price} ريال")
-    escaped_savings = escape_markdown_v2(f"{savings} ريال")
+    # Escape text for MarkdownV2 (title braces doubled so only {idx} is formatted)
+    escaped_title = escape_markdown_v2(title).replace("{", "{{").replace("}", "}}")
+    escaped_old_price = _escape_cached(f"{old_price} ريال")
+    escaped_new_price = _escape_cached(f"{new_price} ريال")
+    escaped_savings = _escape_cached(f"{savings} ريال")
     
     # Build beautiful caption with emojis and formatting
-    caption = f"*🏷️ المنتج {idx}: {escaped_title}*\n\n"
+    caption = f"*🏷️ المنتج {{idx}}: {escaped_title}*\n\n"
     
     # Price information with beautiful formatting
     if old_price > 0:
@@ -278,7 +557,7 @@ async def _build_caption(product: dict, idx: int) -> str:
     
     return caption
 
-async def _build_product_keyboard(detail_url: str) -> InlineKeyboardMarkup:
+def _build_product_keyboard(detail_url: str) -> InlineKeyboardMarkup:
     """Build beautiful inline keyboard for product."""
     # Create a more attractive button
     button = InlineKeyboardButton(
@@ -288,7 +567,6 @@ async def _build_product_keyboard(detail_url: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[[button]])
 
 # Handle other platforms (currently only Amazon works)
-@router.message(F.text.in_(["⚡ علي إكس براس", "🛍️ تريندويل"]))
 async def other_platforms_handler(message: Message):
     """Handle other platforms - show coming soon message."""
     platform_name = message.text
@@ -300,20 +578,32 @@ async def other_platforms_handler(message: Message):
         "💎 *يمكنك تجربة منصة أمازون الآن!*"
     )
     
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="🚀 أمازون")],
-            [KeyboardButton(text="↩️ رجوع إلى المنصات")]
-        ],
-        resize_keyboard=True
-    )
-    
-    await message.answer(coming_soon_text, reply_markup=keyboard, parse_mode="Markdown")
+    await message.answer(coming_soon_text, reply_markup=COMING_SOON_KB, parse_mode="Markdown")
+
+# Button text dispatch table, so each message costs one dict lookup instead of a filter per handler
+_DISPATCH: dict[str, Callable[[Message], Awaitable[None]]] = {
+    PLATFORM_MAP["amazon"]: amazon_handler,
+    "↩️ رجوع إلى المنصات": back_to_platforms_handler,
+    "🛒 عرض المزيد": show_more_handler,
+    **{text: other_platforms_handler for text in _COMING_SOON_TEXTS},
+    **{text: category_handler for text in _CATEGORY_VALUES},
+}
+
+@router.message(F.text)
+async def text_dispatcher(message: Message):
+    """Route keyboard button presses to their handler."""
+    handler = _DISPATCH.get(message.text)
+    if handler:
+        await handler(message)
 
 # Main entry point
 async def main():
     """Start the bot."""
     logger.info("🚀 Starting Beautiful E-Commerce Bot...")
+    try:
+        load_products()  # Warm the products cache before handling updates
+    except (FileNotFoundError, ValueError) as e:
+        logger.error(f"Data load error: {e}")
     await dp.start_polling(bot)
 
 if __name__ == "__main__":